@@ -4,7 +4,7 @@ Binance Trading Bot Script with Simulated and Real Trading Modes
 
 Requirements Implemented:
 1. Mode switching (simulated vs real) using different API keys.
-2. Queries Binance for the Top Gainers using the 24-hour ticker data (using BUY_TRIGGER threshold) via get_ticker().
+2. Queries Binance for the Top Gainers using the 24-hour ticker data (using BUY_TRIGGER threshold), streamed over the !ticker@arr websocket.
 3. Uses an INITIAL_WALLET variable for simulated trades.
 4. Trades a fixed TRADE_AMOUNT per coin.
 5. Periodically queries the coins held every 5 minutes.
@@ -23,13 +23,26 @@ import tkinter as tk
 from tkinter import ttk, font
 from tkinter.scrolledtext import ScrolledText
 import threading
+import asyncio
 import time
+import queue
 import datetime
 import logging
-
-# Import Binance Client and exceptions from python-binance.
+import sqlite3
+import hashlib
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+from dataclasses import dataclass, field
+
+import numpy as np
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Import Binance Client, websocket manager and exceptions from python-binance.
 from binance.client import Client
-from binance.exceptions import BinanceAPIException
+from binance import ThreadedWebsocketManager
+from binance.exceptions import BinanceAPIException, BinanceRequestException
 
 ####################
 # CONFIGURATION (Now primarily through GUI)
@@ -39,6 +52,10 @@ from binance.exceptions import BinanceAPIException
 # Logging
 LOG_FILENAME = "trading_bot.log"
 LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+GUI_LOG_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S" # The log file gets its timestamp from %(asctime)s instead
+GUI_LOG_FLUSH_MS = 100 # How often queued log lines are written to the GUI log area
+GUI_LOG_BATCH_MAX_LINES = 500 # Upper bound on lines inserted per flush
+GUI_LOG_MAX_LINES = 2000 # Oldest lines are trimmed from the log area beyond this
 
 # Trading Modes
 MODE_SIMULATED = "simulated"
@@ -58,10 +75,47 @@ DEFAULT_SELL_LOSS_TRIGGER_PERCENT = "-3.0"
 # Trading Logic Parameters
 TRADING_LOOP_CYCLE_SECONDS = 300
 MAX_OPEN_POSITIONS = 5
+TOP_GAINERS_COUNT = 5 # Candidates returned per gainer scan
 USDT_SUFFIX = "USDT" # For symbol filtering and display
+USDT_SYMBOLS_REFRESH_SECONDS = 3600 # The set of tradable USDT pairs changes on a scale of days
+MARKET_STREAM_STALE_SECONDS = 30 # !ticker@arr pushes every second; older prices mean the stream is dead
+MARKET_STREAM_JOIN_SECONDS = 5 # Wait for a stopped websocket thread to exit (its listener polls every ~3s)
+
+# Binance Rate Limiting (Binance allows 1200 request weight per minute per IP)
+RATE_LIMIT_CAPACITY = 1100 # Request weight per window, kept under the exchange limit
+# Weight Binance charges per endpoint, for the way this bot calls them (e.g. ticker/24hr for all
+# symbols). Endpoints not listed cost DEFAULT_REQUEST_WEIGHT.
+REQUEST_WEIGHTS = {
+    "ticker/24hr": 80,
+    "exchangeInfo": 20,
+    "account": 20,
+}
+DEFAULT_REQUEST_WEIGHT = 1
+RATE_LIMIT_WINDOW_SECONDS = 60
+RATE_LIMIT_BACKOFF_WEIGHT = 1000 # Pause until the next minute once the reported weight exceeds this
+USED_WEIGHT_HEADER = "X-MBX-USED-WEIGHT-1M"
+# Position Persistence (real mode only; simulated positions die with the session)
+POSITIONS_DB_FILENAME = "positions.db" # Rows are keyed by a hash of the API key, so accounts never mix
+POSITION_BALANCE_TOLERANCE = 0.98 # Buy fees may be taken from the bought asset, so holdings can sit slightly below quantity
+# HTTP Connection Pooling (one keep-alive pool shared by every REST call)
+HTTP_POOL_CONNECTIONS = 16
+HTTP_POOL_MAXSIZE = 16
+HTTP_MAX_RETRIES = 3 # Failed connects for any request; read errors and 429/5xx only for GETs
+HTTP_RETRY_BACKOFF_SECONDS = 0.2
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# GUI Snapshot Hand-off (trading thread -> Tk thread)
+SNAPSHOT_QUEUE_SIZE = 4 # Oldest snapshot is dropped when the GUI falls behind
+POSITIONS_TABLE_REFRESH_MS = 500 # How often the GUI polls for a new snapshot
+SNAPSHOT_PUBLISH_SECONDS = 2 # How often the trading thread re-prices positions for the GUI between cycles
 
 # GUI Messages & Placeholders
 CLIENT_INIT_FAILURE_MESSAGE = "STOPPED_CLIENT_INIT_FAILURE"
+MARKET_STREAM_FAILURE_MESSAGE = "STOPPED_MARKET_STREAM_FAILURE"
+STOP_SENTINEL_MESSAGES = { # Sentinels the trading thread sends to make the GUI reset itself
+    CLIENT_INIT_FAILURE_MESSAGE: "CRITICAL ERROR: Binance client failed to initialize. Trading stopped.",
+    MARKET_STREAM_FAILURE_MESSAGE: "CRITICAL ERROR: Market data stream could not be started. Trading stopped."
+}
 API_KEY_DISPLAY_TRUNCATE_LENGTH = 5 # For obfuscating API key in display
 PLACEHOLDER_NA = "N/A"
 PLACEHOLDER_ERROR = "Error"
@@ -96,17 +150,280 @@ LABEL_API_KEY_USED = "API Key Used:" # For active config display
 # --- End Application Constants ---
 
 # Logging configuration
-logging.basicConfig(
-    filename=LOG_FILENAME,
-    level=logging.INFO,
-    format=LOG_FORMAT
-)
+# Callers only enqueue records; a QueueListener thread does the file writes, keeping
+# disk latency off the trading path.
+log_queue = queue.Queue(-1)
+log_file_handler = logging.FileHandler(LOG_FILENAME)
+log_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+log_listener = QueueListener(log_queue, log_file_handler)
+logging.getLogger().setLevel(logging.INFO)
+logging.getLogger().addHandler(QueueHandler(log_queue))
+log_listener.start()
+atexit.register(log_listener.stop) # Flush queued records on exit
+
+####################
+# BINANCE CLIENT
+####################
+
+class RateLimiter:
+    """
+    Thread-safe token bucket measured in request weight. acquire(weight) blocks until that many
+    tokens are available, so bursts are spread out instead of tripping Binance's weight limit.
+    """
+    def __init__(self, capacity, window_seconds):
+        self.capacity = capacity
+        self.refill_rate = capacity / window_seconds # Tokens per second
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0 # Monotonic time before which no tokens are handed out
+        self.lock = threading.Lock()
+
+    def acquire(self, weight=1):
+        weight = min(weight, self.capacity) # A request heavier than the bucket waits for a full one
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+                self.updated_at = now
+                if now >= self.paused_until and self.tokens >= weight:
+                    self.tokens -= weight
+                    return
+                wait = max(self.paused_until - now, (weight - self.tokens) / self.refill_rate)
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class FastClient(Client):
+    """
+    python-binance Client that decodes REST responses with orjson instead of the stdlib json module,
+    throttles every request through a RateLimiter and reuses pooled keep-alive connections.
+    """
+    def __init__(self, *args, **kwargs):
+        # Set before Client.__init__, which already issues a ping
+        self.rate_limiter = RateLimiter(RATE_LIMIT_CAPACITY, RATE_LIMIT_WINDOW_SECONDS)
+        super().__init__(*args, **kwargs)
+
+    def _init_session(self):
+        session = super()._init_session()
+        # Explicit pool so warm TLS connections are reused instead of re-handshaking
+        # Retries are limited to GETs so a timed-out order is never placed twice
+        retries = Retry(total=HTTP_MAX_RETRIES, backoff_factor=HTTP_RETRY_BACKOFF_SECONDS,
+                        status_forcelist=HTTP_RETRY_STATUSES, allowed_methods=frozenset({'GET'}),
+                        raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retries)
+        session.mount('https://', adapter)
+        return session
+
+    def _request(self, method, uri, *args, **kwargs):
+        endpoint = uri.rsplit('/v3/', 1)[-1] # e.g. https://api.binance.com/api/v3/ticker/24hr -> ticker/24hr
+        self.rate_limiter.acquire(REQUEST_WEIGHTS.get(endpoint, DEFAULT_REQUEST_WEIGHT))
+        try:
+            return super()._request(method, uri, *args, **kwargs)
+        finally:
+            self.check_used_weight()
+
+    def check_used_weight(self):
+        # Binance reports the IP's request weight for the current minute on every response
+        response = getattr(self, 'response', None)
+        if response is None: return
+        try:
+            used_weight = int(response.headers.get(USED_WEIGHT_HEADER, 0))
+        except ValueError:
+            return
+        if used_weight > RATE_LIMIT_BACKOFF_WEIGHT:
+            backoff = RATE_LIMIT_WINDOW_SECONDS - (time.time() % RATE_LIMIT_WINDOW_SECONDS)
+            logging.warning("[RATE_LIMIT] Used weight %d exceeds %d; pausing requests for %.1fs.", used_weight, RATE_LIMIT_BACKOFF_WEIGHT, backoff)
+            self.rate_limiter.pause(backoff)
+
+    @staticmethod
+    def _handle_response(response):
+        if not (200 <= response.status_code < 300):
+            raise BinanceAPIException(response, response.status_code, response.text)
+        if not response.content:
+            return {}
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            raise BinanceRequestException(f"Invalid Response: {response.text}")
+
+####################
+# POSITIONS STORE
+####################
+
+@dataclass(frozen=True, slots=True)
+class Position:
+    """One row of Positions, as returned by get() and items()."""
+    buy_price: float
+    quantity: float
+    timestamp: datetime.datetime
+
+
+@dataclass(slots=True)
+class Positions:
+    """
+    Open positions kept as parallel arrays (struct-of-arrays) rather than a dict per symbol,
+    so change % and sell triggers for every position are computed in one vectorized pass.
+    Row i of each array belongs to symbols[i]. Rows are read as Position records
+    through get() and items().
+    With a database attached, every add/remove is written through to SQLite so open
+    positions survive a restart.
+    """
+    symbols: list = field(default_factory=list)
+    buy_px: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float64))
+    qty: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float64))
+    ts: np.ndarray = field(default_factory=lambda: np.empty(0, dtype="datetime64[us]"))
+    # The GUI thread reads while the trading thread writes; keep the arrays aligned
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    db: sqlite3.Connection = field(default=None, repr=False, compare=False)
+    account: str = field(default=None, repr=False, compare=False) # Key of this store's rows in the database
+
+    def attach_db(self, path, account, restore=True):
+        """
+        Open (or create) the positions database at path, closing any database already attached.
+        Only rows stored under account are read or written.
+        With restore, the rows it holds replace the in-memory positions. Without it, the in-memory
+        positions are authoritative and overwrite the table, so rows held while the database was
+        unavailable are persisted rather than lost.
+        """
+        self.close_db()
+        db = sqlite3.connect(path, isolation_level=None, check_same_thread=False) # Autocommit; writes are serialized by lock
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("CREATE TABLE IF NOT EXISTS account_positions("
+                       "account TEXT, symbol TEXT, buy_price REAL, quantity REAL, ts TEXT, PRIMARY KEY (account, symbol))")
+            if not restore:
+                with self.lock:
+                    rows = [(account, symbol, float(self.buy_px[i]), float(self.qty[i]), self.ts[i].astype(datetime.datetime).isoformat())
+                            for i, symbol in enumerate(self.symbols)]
+                    with db: # One transaction: the table never holds a partial copy
+                        db.execute("BEGIN")
+                        db.execute("DELETE FROM account_positions WHERE account = ?", (account,))
+                        db.executemany("INSERT INTO account_positions VALUES (?, ?, ?, ?, ?)", rows)
+                    self.db, self.account = db, account
+                return
+            rows = db.execute("SELECT symbol, buy_price, quantity, ts FROM account_positions WHERE account = ?", (account,)).fetchall()
+            # Build everything before swapping in, so a bad row leaves the store untouched
+            symbols = [symbol for symbol, _, _, _ in rows]
+            buy_px = np.array([buy_price for _, buy_price, _, _ in rows], dtype=np.float64)
+            qty = np.array([quantity for _, _, quantity, _ in rows], dtype=np.float64)
+            ts = np.array([datetime.datetime.fromisoformat(ts) for _, _, _, ts in rows], dtype="datetime64[us]")
+        except Exception:
+            db.close()
+            raise
+        with self.lock:
+            self.db, self.account = db, account
+            self.symbols, self.buy_px, self.qty, self.ts = symbols, buy_px, qty, ts
+
+    def close_db(self):
+        with self.lock:
+            if self.db is not None:
+                self.db.close()
+                self.db = None
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self.symbols
+
+    def __iter__(self):
+        return iter(list(self.symbols))
+
+    def add(self, symbol, buy_price, quantity, timestamp):
+        with self.lock:
+            self.symbols.append(symbol)
+            self.buy_px = np.append(self.buy_px, buy_price)
+            self.qty = np.append(self.qty, quantity)
+            self.ts = np.append(self.ts, np.datetime64(timestamp, "us"))
+            self._write_through("INSERT OR REPLACE INTO account_positions VALUES (?, ?, ?, ?, ?)",
+                                (self.account, symbol, float(buy_price), float(quantity), timestamp.isoformat()))
+
+    def remove(self, symbol):
+        with self.lock:
+            self._delete(self.symbols.index(symbol))
+
+    def pop(self, symbol):
+        """Remove symbol's row and return it as a Position, or None if it is not held."""
+        with self.lock:
+            i = self._index(symbol)
+            if i is None: return None
+            position = self._row(i)
+            self._delete(i)
+            return position
+
+    def get(self, symbol):
+        with self.lock:
+            i = self._index(symbol)
+            return None if i is None else self._row(i)
+
+    def items(self):
+        with self.lock:
+            return [(symbol, self._row(i)) for i, symbol in enumerate(self.symbols)]
+
+    def arrays(self):
+        """Consistent copies of (symbols, buy prices, quantities) for vectorized math."""
+        with self.lock:
+            return list(self.symbols), self.buy_px.copy(), self.qty.copy()
+
+    def _index(self, symbol):
+        # One scan of symbols instead of an `in` test followed by index()
+        try:
+            return self.symbols.index(symbol)
+        except ValueError:
+            return None
+
+    def _delete(self, i):
+        symbol = self.symbols.pop(i)
+        self.buy_px = np.delete(self.buy_px, i)
+        self.qty = np.delete(self.qty, i)
+        self.ts = np.delete(self.ts, i)
+        self._write_through("DELETE FROM account_positions WHERE account = ? AND symbol = ?", (self.account, symbol))
+
+    def _write_through(self, sql, params):
+        # Caller holds the lock. A failed write (locked by another instance, disk full) must not
+        # undo the in-memory change or fail the trade, so the database is detached instead and
+        # positions carry on in memory only.
+        if self.db is None: return
+        try:
+            self.db.execute(sql, params)
+        except sqlite3.Error as e:
+            logging.error("[POSITIONS_DB_ERROR] Write to the positions database failed, positions will no longer be persisted: %s", e)
+            try:
+                self.db.close()
+            except sqlite3.Error:
+                pass
+            self.db = None
+
+    def _row(self, i):
+        return Position(float(self.buy_px[i]), float(self.qty[i]), self.ts[i].astype(datetime.datetime))
 
 ####################
 # TRADING BOT CLASS
 ####################
 
 class TradingBot:
+    __slots__ = (
+        'log_callback', 'api_key', 'api_secret', 'trading_mode',
+        'buy_trigger', 'initial_wallet', 'trade_amount', 'sell_profit_trigger', 'sell_loss_trigger',
+        'trading_active', '_stop_event', 'positions', 'wallet', 'price_cache', 'change_cache',
+        'ticker_socket_manager', 'ticker_socket_loop', 'ticker_socket_name', '_stream_failed', 'prices_updated_at', 'snapshot_queue', 'usdt_symbols', 'usdt_symbols_refreshed_at', 'client',
+        'execute_buy', 'execute_sell', 'buy_prefix', 'sell_prefix', '_log_timestamp_cache'
+    )
+
+    # Log templates for the per-trade and per-position lines, parsed once instead of per call
+    BUY_ATTEMPT_TPL = "{prefix} [ATTEMPT] Attempting to BUY {amount:.2f} USDT of {symbol} at {price:.4f} USDT."
+    BUY_SIM_SUCCESS_TPL = "{prefix} [SUCCESS] {symbol} - Qty: {qty:.6f} at Price: {price:.4f}. New Wallet: {wallet:.2f} USDT."
+    BUY_REAL_SUCCESS_TPL = "{prefix} [SUCCESS] {symbol} - Purchased {qty:.6f} at {price:.4f} USDT."
+    SELL_ATTEMPT_TPL = "{prefix} [ATTEMPT] Attempting to SELL {qty:.6f} {symbol} at {price:.4f} USDT."
+    SELL_SIM_SUCCESS_TPL = "{prefix} [SUCCESS] {symbol} - Sold at {price:.4f}. P/L: {pnl:.2f} USDT. New Wallet: {wallet:.2f} USDT."
+    SELL_REAL_SUCCESS_TPL = "{prefix} [SUCCESS] {symbol} - Sold {qty:.6f} at {price:.4f} USDT. P/L: {pnl:.2f} USDT."
+    POSITION_STATUS_TPL = "[POSITION_STATUS] {symbol} - Buy: {buy:.4f}, Current: {current:.4f}, Change: {change:.2f}%"
+    GAINER_FORMAT = "{0[symbol]} ({0[change_pct]:.2f}%)".format # Bound once; mapped over each scan's gainers
+
     def __init__(self, log_callback, api_key, api_secret, trading_mode,
                  buy_trigger, initial_wallet, trade_amount,
                  sell_profit_trigger, sell_loss_trigger):
@@ -114,6 +431,7 @@ class TradingBot:
         Initialize the trading bot with configuration parameters.
         """
         self.log_callback = log_callback
+        self._log_timestamp_cache = (0, "") # (epoch second, formatted GUI timestamp)
         self.api_key = api_key
         self.api_secret = api_secret
         self.trading_mode = trading_mode.lower()
@@ -124,19 +442,39 @@ class TradingBot:
         self.sell_loss_trigger = sell_loss_trigger
 
         self.trading_active = False
-        self.positions = {} # {symbol: {buy_price, quantity, timestamp}}
+        self._stop_event = threading.Event() # Set by stop(); wakes the loop out of its cycle wait
+        self.positions = Positions()
         self.wallet = 0.0
-
+        self.price_cache = {} # {symbol: last_price}, kept current by the !ticker@arr stream
+        self.change_cache = {} # {symbol: 24hr price change %}, kept current by the same stream
+        self.ticker_socket_manager = None
+        self.ticker_socket_loop = None # Private asyncio loop of the current websocket manager
+        self.ticker_socket_name = None # Stream name returned by start_ticker_socket, for stop_socket
+        self._stream_failed = threading.Event() # Set by the websocket thread on its first error; cleared by a restart
+        self.prices_updated_at = 0.0 # Monotonic time of the last REST seed or stream batch
+        self.snapshot_queue = queue.Queue(maxsize=SNAPSHOT_QUEUE_SIZE) # Positions snapshots for the GUI table
+        self.usdt_symbols = frozenset() # Tradable USDT pairs, from exchange info
+        self.usdt_symbols_refreshed_at = 0.0
+
+        # The mode is fixed for the bot's lifetime, so bind the order paths once
         if self.trading_mode == MODE_SIMULATED:
             self.wallet = self.initial_wallet
+            self.execute_buy, self.execute_sell = self._execute_buy_sim, self._execute_sell_sim
+            self.buy_prefix, self.sell_prefix = "[BUY_SIM]", "[SELL_SIM]"
+        else:
+            self.execute_buy, self.execute_sell = self._execute_buy_real, self._execute_sell_real
+            self.buy_prefix, self.sell_prefix = "[BUY_REAL]", "[SELL_REAL]"
         
         self.client = None
         try:
-            self.client = Client(self.api_key, self.api_secret)
+            self.client = FastClient(self.api_key, self.api_secret)
             self.client.ping() # Test connection
             self.log(f"Successfully initialized Binance client in {self.trading_mode.upper()} mode.")
             if self.trading_mode == MODE_SIMULATED:
                 self.log(f"Simulated mode: Initial wallet set to {self.wallet:.2f} USDT.")
+            else: # Restore only once the client can check the rows against the account
+                self.open_positions_db()
+                self.reconcile_positions()
             # In real mode, wallet balance is managed by Binance. We could fetch it if needed:
             # else:
             #     account_info = self.client.get_account()
@@ -153,171 +491,426 @@ class TradingBot:
             self.client = None # Critical error, bot cannot function
 
 
+    def open_positions_db(self, restore=True):
+        # Real mode only. On failure the in-memory positions are kept, just not persisted.
+        # Rows are stored under a hash of the API key rather than the key itself.
+        account = hashlib.sha256(self.api_key.encode()).hexdigest()
+        try:
+            self.positions.attach_db(POSITIONS_DB_FILENAME, account, restore=restore)
+            if restore and self.positions:
+                self.log(f"[POSITIONS_RESTORED] Restored {len(self.positions)} open positions from {POSITIONS_DB_FILENAME}: {', '.join(self.positions)}")
+        except (sqlite3.Error, ValueError) as e:
+            self.log(f"[POSITIONS_DB_ERROR] Could not load {POSITIONS_DB_FILENAME}, positions will not be persisted: {str(e)}")
+
+    def reconcile_positions(self):
+        """
+        Drop positions the account's balances no longer cover, e.g. coins sold outside the bot.
+        Such rows would otherwise hold a MAX_OPEN_POSITIONS slot and fail to sell every cycle.
+        """
+        if not self.positions: return
+        try:
+            balances = {b['asset']: float(b['free']) + float(b['locked']) for b in self.client.get_account()['balances']}
+        except Exception as e:
+            self.log(f"[POSITIONS_RECONCILE_ERROR] Could not fetch account balances; keeping positions unchecked: {str(e)}")
+            return
+        for symbol, position in self.positions.items():
+            asset = symbol[:-len(USDT_SUFFIX)] if symbol.endswith(USDT_SUFFIX) else symbol
+            held = balances.get(asset, 0.0)
+            if held < position.quantity * POSITION_BALANCE_TOLERANCE:
+                self.log(f"[POSITIONS_RECONCILE] Dropping {symbol}: account holds {held:.6f} {asset}, position expects {position.quantity:.6f}.")
+                self.positions.remove(symbol)
+
+    def resume(self, buy_trigger, trade_amount, sell_profit_trigger, sell_loss_trigger):
+        """
+        Prepare a stopped bot to run trading_loop again with new trading parameters, keeping
+        its Binance client session, wallet and open positions.
+        """
+        self.buy_trigger = buy_trigger
+        self.trade_amount = trade_amount
+        self.sell_profit_trigger = sell_profit_trigger
+        self.sell_loss_trigger = sell_loss_trigger
+        self._stop_event.clear()
+        if self.trading_mode == MODE_REAL:
+            self.open_positions_db(restore=False) # The positions this bot holds in memory are the truth
+            self.reconcile_positions() # Coins may have been sold by hand while the bot was stopped
+        self.log(f"Resuming in {self.trading_mode.upper()} mode with the existing Binance client ({len(self.positions)} open positions kept).")
+
     def log(self, message):
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        full_message = f"[{timestamp}] {message}"
-        logging.info(full_message)
+        logging.info(message) # LOG_FORMAT already stamps the record
         if callable(self.log_callback):
-            self.log_callback(full_message)
+            self.log_callback(f"[{self.log_timestamp()}] {message}")
+
+    def log_timestamp(self):
+        # Timestamps have one-second resolution; format once per second, not once per line.
+        # The (second, text) pair is swapped as one tuple so other threads never see a mix.
+        now = int(time.time())
+        cached_second, cached_text = self._log_timestamp_cache
+        if now != cached_second:
+            cached_text = time.strftime(GUI_LOG_TIMESTAMP_FORMAT, time.localtime(now))
+            self._log_timestamp_cache = (now, cached_text)
+        return cached_text
+
+    def log_enabled(self):
+        # False only when neither the log file nor the GUI would receive an INFO line,
+        # letting hot paths skip the float formatting entirely
+        return callable(self.log_callback) or logging.getLogger().isEnabledFor(logging.INFO)
+
+    def refresh_usdt_symbols(self, force=False):
+        """
+        Rebuild the set of tradable USDT pairs from exchange info, at most once every
+        USDT_SYMBOLS_REFRESH_SECONDS unless forced. Returns False if the fetch failed.
+        """
+        if not force and time.time() - self.usdt_symbols_refreshed_at < USDT_SYMBOLS_REFRESH_SECONDS:
+            return True
+        try:
+            info = self.client.get_exchange_info()
+        except Exception as e:
+            self.log(f"[SYMBOLS_ERROR] Error fetching exchange info: {str(e)}")
+            return False
+        self.usdt_symbols = frozenset(
+            s['symbol'] for s in info['symbols'] if s['quoteAsset'] == USDT_SUFFIX and s['status'] == 'TRADING'
+        )
+        self.usdt_symbols_refreshed_at = time.time()
+        # Drop cached pairs that stopped trading; open positions keep their prices
+        for symbol in list(self.change_cache):
+            if not self.is_tracked_symbol(symbol):
+                self.change_cache.pop(symbol, None)
+                self.price_cache.pop(symbol, None)
+        self.log(f"[SYMBOLS] Tracking {len(self.usdt_symbols)} tradable {USDT_SUFFIX} pairs.")
+        return True
+
+    def is_tracked_symbol(self, symbol):
+        return symbol in self.usdt_symbols or symbol in self.positions
+
+    def start_market_stream(self):
+        """
+        Seed the price caches from one REST snapshot, then keep them current with the
+        all-market !ticker@arr websocket stream so the trading loop never polls for prices.
+        Only tradable USDT pairs (and open positions) are cached.
+        """
+        if not self.client: return False
+        if not self.refresh_usdt_symbols(force=True): return False
+        try:
+            for ticker in self.client.get_ticker():
+                if not self.is_tracked_symbol(ticker['symbol']):
+                    continue
+                self.price_cache[ticker['symbol']] = float(ticker['lastPrice'])
+                self.change_cache[ticker['symbol']] = float(ticker['priceChangePercent'])
+            self.prices_updated_at = time.monotonic()
+        except Exception as e:
+            self.log(f"[MARKET_STREAM_ERROR] Error seeding prices from 24hr ticker data: {str(e)}")
+            return False
 
-    def get_top_gainers(self):
-        self.log("[GAINER_SCAN] Querying top gainers using Binance 24hr ticker data.")
-        gainers = []
-        if not self.client: return gainers
         try:
-            tickers = self.client.get_ticker()
+            # A fresh loop per manager: python-binance would otherwise reuse this thread's loop,
+            # which a previous manager's thread may still be running after a restart
+            self.ticker_socket_loop = asyncio.new_event_loop()
+            self.ticker_socket_manager = ThreadedWebsocketManager(api_key=self.api_key, api_secret=self.api_secret, loop=self.ticker_socket_loop)
+            self.ticker_socket_manager.start()
+            self._stream_failed.clear()
+            self.ticker_socket_name = self.ticker_socket_manager.start_ticker_socket(callback=self.handle_ticker_message)
+            self.log(f"[MARKET_STREAM] Subscribed to the all-market ticker stream ({len(self.price_cache)} symbols seeded).")
         except Exception as e:
-            self.log(f"[GAINER_SCAN_ERROR] Error fetching 24hr ticker data: {str(e)}")
-            return gainers
-        
-        for ticker in tickers:
-            symbol = ticker['symbol']
-            if not symbol.endswith(USDT_SUFFIX):
-                continue
+            self.log(f"[MARKET_STREAM_ERROR] Error starting ticker websocket: {str(e)}")
+            self.stop_market_stream()
+            return False
+        return True
+
+    def stop_market_stream(self):
+        manager, loop = self.ticker_socket_manager, self.ticker_socket_loop
+        self.ticker_socket_manager = self.ticker_socket_loop = self.ticker_socket_name = None
+        if manager:
             try:
-                change_pct = float(ticker['priceChangePercent'])
-                if change_pct >= self.buy_trigger:
-                    current_price = float(ticker['lastPrice'])
-                    gainers.append({'symbol': symbol, 'change_pct': change_pct, 'current_price': current_price})
+                manager.stop()
+                if manager.is_alive(): # Not alive if start() never ran
+                    manager.join(timeout=MARKET_STREAM_JOIN_SECONDS)
             except Exception as e:
-                self.log(f"[GAINER_SCAN_ERROR] Error processing ticker for {symbol}: {str(e)}")
+                self.log(f"[MARKET_STREAM_ERROR] Error stopping ticker websocket: {str(e)}")
+            if manager.is_alive():
+                self.log("[MARKET_STREAM_ERROR] Ticker websocket thread did not exit; leaving its event loop open.")
+                return
+        if loop and not loop.is_running():
+            loop.close()
+
+    def prices_are_fresh(self):
+        return time.monotonic() - self.prices_updated_at <= MARKET_STREAM_STALE_SECONDS
+
+    def restart_market_stream(self):
+        # Also reseeds the caches over REST, so prices are fresh again even if the
+        # websocket itself cannot be re-subscribed. The failure flag is cleared up front so a
+        # restart that fails is retried by the once-per-cycle staleness check, not every slice.
+        self._stream_failed.clear()
+        self.stop_market_stream()
+        self.start_market_stream()
+
+    def ensure_fresh_prices(self):
+        """
+        Restart the market stream if it reported an error or has gone quiet.
+        Returns False if prices are still stale; the caller must not trade on them.
+        """
+        if self._stream_failed.is_set():
+            self.log("[MARKET_STREAM_ERROR] Ticker websocket failed; restarting the market stream.")
+            self.restart_market_stream()
+        elif not self.prices_are_fresh():
+            self.log(f"[MARKET_STREAM_STALE] No price update for {time.monotonic() - self.prices_updated_at:.0f}s; restarting the market stream.")
+            self.restart_market_stream()
+        if self.prices_are_fresh(): return True
+        self.log("[MARKET_STREAM_STALE] Prices are still stale; skipping buys and sells this cycle.")
+        return False
+
+    def handle_ticker_message(self, msg):
+        # Runs on the websocket thread. The stream pushes a list of tickers that changed
+        # in the last second; errors arrive as a dict with 'e' == 'error'. Once the socket
+        # has given up reconnecting, python-binance repeats that dict in a tight loop, so only
+        # the first one is logged: the socket is stopped and the trading thread restarts it.
+        if isinstance(msg, dict):
+            if msg.get('e') == 'error' and not self._stream_failed.is_set():
+                self._stream_failed.set()
+                self.log(f"[MARKET_STREAM_ERROR] {msg.get('type')}: {msg.get('m')}")
+                manager, socket_name = self.ticker_socket_manager, self.ticker_socket_name
+                if manager and socket_name:
+                    try:
+                        manager.stop_socket(socket_name)
+                    except Exception as e:
+                        self.log(f"[MARKET_STREAM_ERROR] Error stopping ticker socket: {str(e)}")
+            return
+        self.prices_updated_at = time.monotonic()
+        for ticker in msg:
+            symbol = ticker.get('s')
+            if not self.is_tracked_symbol(symbol):
+                continue # Skip the ~80% of pairs we never trade before parsing anything
+            last_price, change_pct = ticker.get('c'), ticker.get('P')
+            if not last_price or not change_pct:
                 continue
-        
-        gainers.sort(key=lambda x: x['change_pct'], reverse=True)
-        top_5 = gainers[:5]
-        self.log("[GAINER_SCAN_RESULT] Top gainers: " + ", ".join([f"{g['symbol']} ({round(g['change_pct'],2)}%)" for g in top_5]))
+            try: # Per ticker, so one malformed entry never hides the rest of the batch
+                price, change = float(last_price), float(change_pct)
+            except (ValueError, TypeError):
+                continue
+            self.price_cache[symbol] = price
+            self.change_cache[symbol] = change
+
+    def get_top_gainers(self):
+        self.log("[GAINER_SCAN] Scanning top gainers in the streamed 24hr ticker data.")
+        # Copy first: the websocket thread may add symbols while we scan
+        snapshot = list(self.change_cache.items())
+        if not snapshot: return []
+
+        # Filter and rank in one vectorized pass instead of a Python loop over the tickers.
+        # The cache only holds tradable USDT pairs, so no suffix check is needed here.
+        # Symbols stay a plain tuple: only the K winners are ever looked up, so building a
+        # NumPy string array of every pair would be wasted work
+        symbols, changes = zip(*snapshot)
+        changes = np.fromiter(changes, dtype=np.float64, count=len(snapshot))
+        candidates = np.flatnonzero(changes >= self.buy_trigger)
+        if candidates.size > TOP_GAINERS_COUNT: # O(N) partial selection, then sort only the winners
+            candidates = candidates[np.argpartition(-changes[candidates], TOP_GAINERS_COUNT - 1)[:TOP_GAINERS_COUNT]]
+        candidates = candidates[np.argsort(-changes[candidates], kind="stable")]
+
+        top_5 = []
+        get_price = self.price_cache.get # Hoisted out of the loop
+        for i in candidates:
+            symbol = symbols[i]
+            current_price = get_price(symbol)
+            if current_price:
+                top_5.append({'symbol': symbol, 'change_pct': float(changes[i]), 'current_price': current_price})
+        self.log("[GAINER_SCAN_RESULT] Top gainers: " + ", ".join(map(self.GAINER_FORMAT, top_5)))
         return top_5
 
-    def execute_buy(self, symbol, price):
+    def _execute_buy_sim(self, symbol, price):
         if not self.client: return False
-        prefix = "[BUY_SIM]" if self.trading_mode == MODE_SIMULATED else "[BUY_REAL]"
-
-        if self.trading_mode == MODE_SIMULATED and self.wallet < self.trade_amount:
+        prefix = self.buy_prefix
+        if self.wallet < self.trade_amount:
             self.log(f"{prefix} [FAIL_INSUFFICIENT_FUNDS] Not enough wallet balance ({self.wallet:.2f} USDT) to buy {self.trade_amount:.2f} USDT of {symbol}.")
             return False
 
-        self.log(f"{prefix} [ATTEMPT] Attempting to BUY {self.trade_amount:.2f} USDT of {symbol} at {price:.4f} USDT.")
-        if self.trading_mode == MODE_SIMULATED:
-            quantity = self.trade_amount / price
-            self.wallet -= self.trade_amount
-            self.positions[symbol] = {
-                'buy_price': price, 'quantity': quantity, 'timestamp': datetime.datetime.now()
-            }
-            self.log(f"{prefix} [SUCCESS] {symbol} - Qty: {quantity:.6f} at Price: {price:.4f}. New Wallet: {self.wallet:.2f} USDT.")
-            return True
-        else: # Real mode
-            try:
-                order = self.client.order_market_buy(symbol=symbol, quoteOrderQty=self.trade_amount)
-                executed_price = float(order['fills'][0]['price'])
-                quantity = float(order['executedQty'])
-                self.positions[symbol] = {
-                    'buy_price': executed_price, 'quantity': quantity, 'timestamp': datetime.datetime.now()
-                }
-                self.log(f"{prefix} [SUCCESS] {symbol} - Purchased {quantity:.6f} at {executed_price:.4f} USDT.")
-                return True
-            except BinanceAPIException as e:
-                self.log(f"{prefix} [FAIL_API_ERROR] Binance API error for {symbol}: {str(e)}")
-                return False
-            except Exception as e:
-                self.log(f"{prefix} [FAIL_GENERAL_ERROR] Error for {symbol}: {str(e)}")
-                return False
+        self.log(self.BUY_ATTEMPT_TPL.format(prefix=prefix, amount=self.trade_amount, symbol=symbol, price=price))
+        quantity = self.trade_amount / price
+        self.wallet -= self.trade_amount
+        self.positions.add(symbol, price, quantity, datetime.datetime.now())
+        self.log(self.BUY_SIM_SUCCESS_TPL.format(prefix=prefix, symbol=symbol, qty=quantity, price=price, wallet=self.wallet))
+        return True
 
-    def execute_sell(self, symbol, price):
+    def _execute_buy_real(self, symbol, price):
         if not self.client: return False
-        prefix = "[SELL_SIM]" if self.trading_mode == MODE_SIMULATED else "[SELL_REAL]"
-
-        if symbol not in self.positions:
-            self.log(f"{prefix} [FAIL_NO_POSITION] No open position found for {symbol} to sell.")
+        prefix = self.buy_prefix
+        self.log(self.BUY_ATTEMPT_TPL.format(prefix=prefix, amount=self.trade_amount, symbol=symbol, price=price))
+        try:
+            order = self.client.order_market_buy(symbol=symbol, quoteOrderQty=self.trade_amount)
+            executed_price = float(order['fills'][0]['price'])
+            quantity = float(order['executedQty'])
+            self.positions.add(symbol, executed_price, quantity, datetime.datetime.now())
+            self.log(self.BUY_REAL_SUCCESS_TPL.format(prefix=prefix, symbol=symbol, qty=quantity, price=executed_price))
+            return True
+        except BinanceAPIException as e:
+            self.log(f"{prefix} [FAIL_API_ERROR] Binance API error for {symbol}: {str(e)}")
+            return False
+        except Exception as e:
+            self.log(f"{prefix} [FAIL_GENERAL_ERROR] Error for {symbol}: {str(e)}")
             return False
 
-        position = self.positions[symbol]
-        self.log(f"{prefix} [ATTEMPT] Attempting to SELL {position['quantity']:.6f} {symbol} at {price:.4f} USDT.")
-        if self.trading_mode == MODE_SIMULATED:
-            proceeds = position['quantity'] * price
-            profit_loss = proceeds - (position['quantity'] * position['buy_price'])
-            self.wallet += proceeds
-            self.log(f"{prefix} [SUCCESS] {symbol} - Sold at {price:.4f}. P/L: {profit_loss:.2f} USDT. New Wallet: {self.wallet:.2f} USDT.")
-            del self.positions[symbol]
+    def _open_position_for_sell(self, symbol, price, take=False):
+        # Shared preamble of both sell paths; returns None if there is nothing to sell.
+        # take=True removes the position in the same lookup.
+        if not self.client: return None
+        position = self.positions.pop(symbol) if take else self.positions.get(symbol)
+        if position is None:
+            self.log(f"{self.sell_prefix} [FAIL_NO_POSITION] No open position found for {symbol} to sell.")
+            return None
+        self.log(self.SELL_ATTEMPT_TPL.format(prefix=self.sell_prefix, qty=position.quantity, symbol=symbol, price=price))
+        return position
+
+    def _execute_sell_sim(self, symbol, price):
+        position = self._open_position_for_sell(symbol, price, take=True) # A simulated sell cannot fail
+        if position is None: return False
+        proceeds = position.quantity * price
+        profit_loss = proceeds - (position.quantity * position.buy_price)
+        self.wallet += proceeds
+        self.log(self.SELL_SIM_SUCCESS_TPL.format(prefix=self.sell_prefix, symbol=symbol, price=price, pnl=profit_loss, wallet=self.wallet))
+        return True
+
+    def _execute_sell_real(self, symbol, price):
+        position = self._open_position_for_sell(symbol, price)
+        if position is None: return False
+        prefix = self.sell_prefix
+        try:
+            order = self.client.order_market_sell(symbol=symbol, quantity=position.quantity)
+            executed_price = float(order['fills'][0]['price'])
+            proceeds = float(order['cummulativeQuoteQty']) 
+            profit_loss = proceeds - (position.quantity * position.buy_price)
+            self.log(self.SELL_REAL_SUCCESS_TPL.format(prefix=prefix, symbol=symbol, qty=position.quantity, price=executed_price, pnl=profit_loss))
+            self.positions.remove(symbol)
             return True
-        else: # Real mode
-            try:
-                order = self.client.order_market_sell(symbol=symbol, quantity=position['quantity'])
-                executed_price = float(order['fills'][0]['price'])
-                proceeds = float(order['cummulativeQuoteQty']) 
-                profit_loss = proceeds - (position['quantity'] * position['buy_price'])
-                self.log(f"{prefix} [SUCCESS] {symbol} - Sold {position['quantity']:.6f} at {executed_price:.4f} USDT. P/L: {profit_loss:.2f} USDT.")
-                del self.positions[symbol]
-                return True
-            except BinanceAPIException as e:
-                self.log(f"{prefix} [FAIL_API_ERROR] Binance API error for {symbol}: {str(e)}")
-                return False
-            except Exception as e:
-                self.log(f"{prefix} [FAIL_GENERAL_ERROR] Error for {symbol}: {str(e)}")
-                return False
+        except BinanceAPIException as e:
+            self.log(f"{prefix} [FAIL_API_ERROR] Binance API error for {symbol}: {str(e)}")
+            return False
+        except Exception as e:
+            self.log(f"{prefix} [FAIL_GENERAL_ERROR] Error for {symbol}: {str(e)}")
+            return False
+
+    def mark_to_market(self):
+        """
+        (symbols, buy_prices, quantities, current_prices, change_pcts) for every open position,
+        priced from the streamed cache in one vectorized pass. Missing prices are NaN, which
+        never satisfies either sell trigger.
+        """
+        symbols, buy_prices, quantities = self.positions.arrays()
+        current_prices = np.fromiter((self.price_cache.get(symbol, np.nan) for symbol in symbols), dtype=np.float64, count=len(symbols))
+        change_pcts = (current_prices - buy_prices) / buy_prices * 100.0
+        return symbols, buy_prices, quantities, current_prices, change_pcts
 
     def update_positions(self):
         if not self.client: return
         self.log("[POSITION_CHECKS_START] Starting update and check of open positions.")
-        symbols_to_sell = []
-        for symbol, position in list(self.positions.items()): 
-            try:
-                ticker = self.client.get_symbol_ticker(symbol=symbol)
-                current_price = float(ticker['price'])
-                buy_price = position['buy_price']
-                change_pct = ((current_price - buy_price) / buy_price) * 100.0
-                self.log(f"[POSITION_STATUS] {symbol} - Buy: {buy_price:.4f}, Current: {current_price:.4f}, Change: {change_pct:.2f}%")
-                if change_pct >= self.sell_profit_trigger or change_pct <= self.sell_loss_trigger:
-                    symbols_to_sell.append((symbol, current_price, change_pct))
-            except Exception as e:
-                self.log(f"[POSITION_ERROR] Error updating position for {symbol}: {str(e)}")
-        
-        for symbol, price, change_pct in symbols_to_sell:
-            self.log(f"[SELL_TRIGGERED] Sell condition met for {symbol} (Change: {change_pct:.2f}%). Executing sell.")
-            self.execute_sell(symbol, price)
+        symbols, buy_prices, _, current_prices, change_pcts = self.mark_to_market()
+        if self.log_enabled():
+            for symbol, buy_price, current_price, change_pct in zip(symbols, buy_prices, current_prices, change_pcts):
+                if np.isnan(current_price):
+                    self.log(f"[POSITION_ERROR] No streamed price for {symbol} yet.")
+                else:
+                    self.log(self.POSITION_STATUS_TPL.format(symbol=symbol, buy=buy_price, current=current_price, change=change_pct))
+
+        sell_mask = (change_pcts >= self.sell_profit_trigger) | (change_pcts <= self.sell_loss_trigger)
+        for i in np.flatnonzero(sell_mask):
+            self.log(f"[SELL_TRIGGERED] Sell condition met for {symbols[i]} (Change: {change_pcts[i]:.2f}%). Executing sell.")
+            self.execute_sell(symbols[i], float(current_prices[i]))
         self.log("[POSITION_CHECKS_END] Finished update and check of open positions.")
 
 
+    def publish_positions_snapshot(self):
+        """
+        Push {symbol: (buy_price, quantity, current_price, change_pct)} onto snapshot_queue so the
+        GUI can redraw without touching the network. Prices missing from the cache are None.
+        """
+        symbols, buy_prices, quantities, current_prices, change_pcts = self.mark_to_market()
+        snapshot = {}
+        for symbol, buy_price, quantity, current_price, change_pct in zip(symbols, buy_prices, quantities, current_prices, change_pcts):
+            if np.isnan(current_price):
+                current_price = change_pct = None
+            else:
+                current_price, change_pct = float(current_price), float(change_pct)
+            snapshot[symbol] = (float(buy_price), float(quantity), current_price, change_pct)
+
+        try:
+            self.snapshot_queue.put_nowait(snapshot)
+        except queue.Full:
+            try:
+                self.snapshot_queue.get_nowait() # Drop the oldest; only the latest matters
+            except queue.Empty:
+                pass
+            self.snapshot_queue.put_nowait(snapshot)
+
     def trading_loop(self):
+        try:
+            self.run_trading_cycles()
+        finally: # Every exit path, including the early ones, releases the stream and the DB
+            self.trading_active = False
+            self.stop_market_stream()
+            self.positions.close_db()
+            self.log("[CORE] Trading loop stopped.")
+
+    def run_trading_cycles(self):
         if not self.client:
             self.log("[CRITICAL_ERROR] Trading loop cannot start: Binance client not initialized.")
-            self.trading_active = False 
             if callable(self.log_callback):
                  self.log_callback(CLIENT_INIT_FAILURE_MESSAGE) 
             return
 
+        if not self.start_market_stream():
+            self.log("[CRITICAL_ERROR] Trading loop cannot start: market data stream unavailable.")
+            if callable(self.log_callback):
+                self.log_callback(MARKET_STREAM_FAILURE_MESSAGE)
+            return
+
         self.log("[CORE] Trading loop started.")
-        while self.trading_active:
+        self.trading_active = True
+        self.publish_positions_snapshot() # Show restored or kept positions before the first cycle finishes
+        while not self._stop_event.is_set():
             loop_start_time = time.time()
             
-            self.update_positions()
-            
-            if len(self.positions) < MAX_OPEN_POSITIONS: 
-                top_gainers = self.get_top_gainers()
-                for coin in top_gainers:
-                    if len(self.positions) >= MAX_OPEN_POSITIONS: break
-                    if coin['symbol'] not in self.positions:
-                        self.execute_buy(coin['symbol'], coin['current_price'])
+            self.refresh_usdt_symbols()
+            if self.ensure_fresh_prices(): # Never buy or sell on frozen prices
+                self.update_positions()
+                
+                if len(self.positions) < MAX_OPEN_POSITIONS: 
+                    top_gainers = self.get_top_gainers()
+                    for coin in top_gainers:
+                        if len(self.positions) >= MAX_OPEN_POSITIONS: break
+                        if coin['symbol'] not in self.positions:
+                            self.execute_buy(coin['symbol'], coin['current_price'])
             
+            self.publish_positions_snapshot()
+
             if self.trading_mode == MODE_SIMULATED:
                 self.log(f"[WALLET_SIM] Current Wallet (Simulated): {self.wallet:.2f} USDT")
             
-            pos_summary = [f"{s} (Buy: {p['buy_price']:.4f})" for s, p in self.positions.items()]
-            self.log(f"[POSITIONS_SUMMARY] Open positions ({len(self.positions)}): {', '.join(pos_summary) if pos_summary else 'None'}")
-            
-            elapsed_time = time.time() - loop_start_time
-            sleep_duration = max(0, TRADING_LOOP_CYCLE_SECONDS - elapsed_time) # Target cycle
+            symbols, buy_prices, _ = self.positions.arrays()
+            pos_summary = ", ".join(f"{s} (Buy: {p:.4f})" for s, p in zip(symbols, buy_prices)) or 'None'
+            self.log(f"[POSITIONS_SUMMARY] Open positions ({len(symbols)}): {pos_summary}")
             
-            # Sleep in 1s intervals to allow quick exit if stop signal is received
-            for _ in range(int(sleep_duration)): 
-                if not self.trading_active:
-                    break
-                time.sleep(1)
-        
-        self.log("[CORE] Trading loop stopped.")
+            if self.wait_for_next_cycle(loop_start_time + TRADING_LOOP_CYCLE_SECONDS):
+                break
+
+    def wait_for_next_cycle(self, cycle_deadline):
+        """
+        Sleep until cycle_deadline (a time.time() value), republishing the positions snapshot
+        every SNAPSHOT_PUBLISH_SECONDS so the GUI table tracks the streamed prices.
+        Returns True as soon as stop() is called, so stopping never waits out the cycle.
+        """
+        while True:
+            remaining = cycle_deadline - time.time()
+            if remaining <= 0:
+                return False
+            if self._stop_event.wait(timeout=min(remaining, SNAPSHOT_PUBLISH_SECONDS)):
+                return True
+            if self._stream_failed.is_set(): # Don't sit out the cycle on a dead websocket
+                self.log("[MARKET_STREAM_ERROR] Ticker websocket failed; restarting the market stream.")
+                self.restart_market_stream()
+            self.publish_positions_snapshot()
 
     def stop(self):
         self.log("[CORE] Received stop signal.")
         self.trading_active = False
+        self._stop_event.set()
 
 ####################
 # GUI APPLICATION CLASS
@@ -328,13 +921,17 @@ class GUIApp:
         self.root = root_tk
         self.root.title(WINDOW_TITLE)
         self.bot = None
+        self.stopped_bot = None # Last cleanly stopped bot, reused by start_trading when the session settings match
         self.trading_thread = None
         self.config_widgets = [] # To store config entry/combobox widgets
         self.active_config_labels = {} # To store labels displaying active config
+        self._last_snapshot = {} # Positions snapshot currently shown in the table
+        self.gui_log_queue = queue.Queue() # Log lines waiting to be written to the log area
 
         self.create_widgets()
         self.update_active_config_display(running=False) # Initialize active config display
         self.update_positions_table() # Start periodic table updates
+        self.drain_gui_log_queue() # Start periodic log area updates
 
     def create_widgets(self):
         # Default font
@@ -458,15 +1055,36 @@ class GUIApp:
         self.toggle_initial_wallet_state() # Keep initial wallet consistent
 
     def write_log(self, message):
-        if message == CLIENT_INIT_FAILURE_MESSAGE: 
-            self.write_log("CRITICAL ERROR: Binance client failed to initialize. Trading stopped.")
-            self.stop_trading(force_gui_reset=True) 
-            return
+        # Called from the trading thread as well; widgets are only touched in drain_gui_log_queue
+        self.gui_log_queue.put(message)
 
-        self.log_text.configure(state=tk.NORMAL)
-        self.log_text.insert(tk.END, message + "\n")
-        self.log_text.configure(state=tk.DISABLED)
-        self.log_text.yview(tk.END) # Auto-scroll
+    def drain_gui_log_queue(self):
+        lines = []
+        trading_failed = False
+        try:
+            while len(lines) < GUI_LOG_BATCH_MAX_LINES:
+                message = self.gui_log_queue.get_nowait()
+                if message in STOP_SENTINEL_MESSAGES:
+                    lines.append(STOP_SENTINEL_MESSAGES[message])
+                    trading_failed = True
+                    break
+                lines.append(message)
+        except queue.Empty:
+            pass
+
+        if lines: # One insert for the whole batch is far cheaper than one per line
+            self.log_text.configure(state=tk.NORMAL)
+            self.log_text.insert(tk.END, "\n".join(lines) + "\n")
+            # Trim in the same edit so the widget never grows without bound
+            excess_lines = int(self.log_text.index('end-1c').split('.')[0]) - 1 - GUI_LOG_MAX_LINES
+            if excess_lines > 0:
+                self.log_text.delete('1.0', f"{excess_lines + 1}.0")
+            self.log_text.configure(state=tk.DISABLED)
+            self.log_text.yview(tk.END) # Auto-scroll
+        if trading_failed:
+            self.stop_trading(force_gui_reset=True)
+
+        self.root.after(GUI_LOG_FLUSH_MS, self.drain_gui_log_queue) # Reschedule
 
     def start_trading(self):
         self.write_log("Attempting to start trading bot...")
@@ -526,12 +1144,22 @@ class GUIApp:
         self.stop_button.config(state=tk.NORMAL)
         self.set_config_widgets_state(tk.DISABLED)
 
-        self.bot = TradingBot(
-            log_callback=self.write_log,
-            api_key=api_key_to_use, api_secret=api_secret_to_use, trading_mode=trading_mode,
-            buy_trigger=buy_trigger, initial_wallet=initial_wallet, trade_amount=trade_amount,
-            sell_profit_trigger=sell_profit_trigger, sell_loss_trigger=sell_loss_trigger
-        )
+        # Reuse the last bot when mode, keys and starting wallet are unchanged: this keeps its
+        # warm client session, wallet and positions instead of starting from scratch
+        previous_bot, self.stopped_bot = self.stopped_bot, None
+        if previous_bot and previous_bot.trading_mode == trading_mode and \
+           previous_bot.api_key == api_key_to_use and previous_bot.api_secret == api_secret_to_use and \
+           previous_bot.initial_wallet == initial_wallet:
+            self.bot = previous_bot
+            self.bot.resume(buy_trigger=buy_trigger, trade_amount=trade_amount,
+                            sell_profit_trigger=sell_profit_trigger, sell_loss_trigger=sell_loss_trigger)
+        else:
+            self.bot = TradingBot(
+                log_callback=self.write_log,
+                api_key=api_key_to_use, api_secret=api_secret_to_use, trading_mode=trading_mode,
+                buy_trigger=buy_trigger, initial_wallet=initial_wallet, trade_amount=trade_amount,
+                sell_profit_trigger=sell_profit_trigger, sell_loss_trigger=sell_loss_trigger
+            )
 
         if self.bot.client is None: # Check if client initialization failed in TradingBot
             self.write_log("ERROR: TradingBot failed to initialize Binance client. Cannot start.")
@@ -562,6 +1190,8 @@ class GUIApp:
         self.set_config_widgets_state(tk.NORMAL)
         if not force_gui_reset: # Avoid double logging if forced
             self.write_log("Trading bot stopped.")
+        if self.bot and self.bot.client and not (self.trading_thread and self.trading_thread.is_alive()):
+            self.stopped_bot = self.bot # Kept for reuse by the next start_trading
         self.bot = None # Clear bot instance
         self.update_active_config_display(running=False) # Clear active config display
 
@@ -585,35 +1215,41 @@ class GUIApp:
 
 
     def update_positions_table(self):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        
-        if self.bot and self.bot.client and self.bot.positions:
-            for symbol, data in self.bot.positions.items():
-                try:
-                    ticker = self.bot.client.get_symbol_ticker(symbol=symbol)
-                    current_price = float(ticker['price'])
-                    change_pct = ((current_price - data['buy_price']) / data['buy_price']) * 100.0
-                    self.tree.insert("", tk.END, values=(
-                        COLUMN_SYMBOL: symbol,
-                        COLUMN_BUY_PRICE: f"{data['buy_price']:.4f}",
-                        COLUMN_QUANTITY: f"{data['quantity']:.6f}",
-                        COLUMN_CURRENT_PRICE: f"{current_price:.4f}",
-                        COLUMN_CHANGE_PERCENT: f"{change_pct:.2f}%"
-                    }
-                    self.tree.insert("", tk.END, values=tuple(row_values[col] for col in self.tree_columns))
-                except Exception as e:
-                    # self.write_log(f"Error updating table for {symbol}: {e}") 
-                    row_values = {
-                        COLUMN_SYMBOL: symbol,
-                        COLUMN_BUY_PRICE: f"{data.get('buy_price', 0):.4f}",
-                        COLUMN_QUANTITY: f"{data.get('quantity', 0):.6f}",
-                        COLUMN_CURRENT_PRICE: PLACEHOLDER_ERROR,
-                        COLUMN_CHANGE_PERCENT: PLACEHOLDER_NA
-                    }
-                    self.tree.insert("", tk.END, values=tuple(row_values[col] for col in self.tree_columns))
+        # Consumer side of the bot's snapshot queue: only redraw when a new snapshot arrives
+        snapshot = None
+        if self.bot:
+            try:
+                while True: # Drain to the latest snapshot
+                    snapshot = self.bot.snapshot_queue.get_nowait()
+            except queue.Empty:
+                pass
+        elif self._last_snapshot:
+            snapshot = {} # Bot stopped; clear the table
+
+        if snapshot is not None and snapshot != self._last_snapshot: # Identical snapshots leave the widget alone
+            previous, self._last_snapshot = self._last_snapshot, snapshot
+            # Rows are keyed by symbol (iid): drop closed positions in one call, then update
+            # changed rows in place and insert only newly opened ones
+            closed = [iid for iid in self.tree.get_children() if iid not in snapshot]
+            if closed:
+                self.tree.delete(*closed)
+            for symbol, row in snapshot.items():
+                if previous.get(symbol) == row:
+                    continue # The table already shows this row
+                buy_price, quantity, current_price, change_pct = row
+                values = ( # Same order as self.tree_columns
+                    symbol,
+                    f"{buy_price:.4f}",
+                    f"{quantity:.6f}",
+                    f"{current_price:.4f}" if current_price is not None else PLACEHOLDER_ERROR,
+                    f"{change_pct:.2f}%" if change_pct is not None else PLACEHOLDER_NA
+                )
+                if self.tree.exists(symbol):
+                    self.tree.item(symbol, values=values)
+                else:
+                    self.tree.insert("", tk.END, iid=symbol, values=values)
         
-        self.root.after(10000, self.update_positions_table) # Reschedule
+        self.root.after(POSITIONS_TABLE_REFRESH_MS, self.update_positions_table) # Reschedule
 
 ####################
 # MAIN: Launch the GUI Application